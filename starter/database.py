@@ -1,5 +1,95 @@
+import csv
+from collections import defaultdict
+
+from exceptions import UnsupportedFeature
 from models import OrbitPath, NearEarthObject
-import pandas as pd
+
+
+class Histogram(object):
+    """
+    Equi-width histogram of a numeric attribute, used to estimate the fraction of values matching a filter.
+    """
+
+    def __init__(self, values, buckets=20):
+        """
+        :param values: list of values, missing (None, empty or NaN) and non-numeric values are skipped
+        :param buckets: int number of equal width buckets between the min and max value
+        """
+        values = [value for value in values if isinstance(value, (int, float)) and value == value]
+        self.count = len(values)
+        self.low = min(values, default=0.0)
+        self.high = max(values, default=0.0)
+        self.width = (self.high - self.low) / buckets or 1.0
+        self.counts = [0] * buckets
+        for value in values:
+            self.counts[min(int((value - self.low) / self.width), buckets - 1)] += 1
+
+    def fraction_below(self, value):
+        """
+        :param value: float to compare against
+        :return: float estimated fraction of values smaller than value, assuming uniform values within a bucket
+        """
+        if not self.count or value <= self.low:
+            return 0.0
+        if value > self.high:
+            return 1.0
+        position = (value - self.low) / self.width
+        bucket = min(int(position), len(self.counts) - 1)
+        below = sum(self.counts[:bucket]) + self.counts[bucket] * (position - bucket)
+        return min(below / self.count, 1.0)
+
+    def fraction_equal(self, value):
+        """
+        :param value: float to compare against
+        :return: float estimated fraction of values equal to value, assuming distinct values
+        """
+        if not self.count or not self.low <= value <= self.high:
+            return 0.0
+        return 1.0 / self.count
+
+
+class NEOStatistics(object):
+    """
+    Object holding cardinality statistics of the OrbitPaths in a NEODatabase, gathered at load time for
+    the query planner: per-day counts of orbits and distinct NEOs, the hazardous ratio and histograms of diameter and distance.
+    """
+
+    def __init__(self):
+        self.day_counts = {}
+        self.orbit_count = 0
+        self.neo_count = 0
+        self.day_neo_counts = {}
+        self.hazardous_count = 0
+        self.diameter_min_km = Histogram([])
+        self.diameter_max_km = Histogram([])
+        self.miss_distance_kilometers = Histogram([])
+
+    def build(self, neo_count, day_dict):
+        """
+        Computes the statistics from the OrbitPaths of each day. Values are only collected while building, so the
+        statistics hold no per-orbit data, and are rebuilt from day_dict after each load.
+
+        :param neo_count: int number of unique NearEarthObjects
+        :param day_dict: dict of close approach day to list of OrbitPath
+        :return: None
+        """
+        self.neo_count = neo_count
+        self.day_counts = {day: len(orbits) for day, orbits in day_dict.items()}
+        self.day_neo_counts = {
+            day: len({neo for orbit in orbits for neo in orbit.neo_set}) for day, orbits in day_dict.items()
+        }
+        orbits = [orbit for day_orbits in day_dict.values() for orbit in day_orbits]
+        self.orbit_count = len(orbits)
+        self.hazardous_count = sum(
+            any(neo.is_potentially_hazardous_asteroid is True for neo in orbit.neo_set) for orbit in orbits
+        )
+        self.diameter_min_km = Histogram([neo.diameter_min_km for orbit in orbits for neo in orbit.neo_set])
+        self.diameter_max_km = Histogram([neo.diameter_max_km for orbit in orbits for neo in orbit.neo_set])
+        self.miss_distance_kilometers = Histogram([orbit.miss_distance_kilometers for orbit in orbits])
+
+    @property
+    def hazardous_ratio(self):
+        return self.hazardous_count / self.orbit_count if self.orbit_count else 0.0
 
 
 class NEODatabase(object):
@@ -9,17 +99,39 @@ class NEODatabase(object):
     To support optimized date searching, a dict mapping of all orbit date paths to the Near Earth Objects
     recorded on a given day is maintained. Additionally, all unique instances of a Near Earth Object
     are contained in a dict mapping the Near Earth Object name to the NearEarthObject instance.
+
+    Repeated strings (urls, orbiting bodies and close approach days) are stored once in the StringDictionary
+    shared by all the models, NearEarthObject.strings. A dict mapping each close approach day to its OrbitPaths and the NEOStatistics
+    used by the query planner are also maintained.
     """
 
-    def __init__(self, filename):
+    Engines = ['csv', 'pandas']
+
+    # Boolean csv values recognised by pandas.read_csv
+    BoolValues = {'True': True, 'TRUE': True, 'true': True, 'False': False, 'FALSE': False, 'false': False}
+
+    # Missing csv values recognised by pandas.read_csv, None is a cell missing from a short row
+    NaValues = {
+        None, '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN', '<NA>',
+        'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+    }
+
+    def __init__(self, filename, engine='csv'):
         """
         :param filename: str representing the pathway of the filename containing the Near Earth Object data
+        :param engine: str representing the csv reader to use, one of NEODatabase.Engines
         """
         # TODO: What data structures will be needed to store the NearEarthObjects and OrbitPaths?
         # TODO: Add relevant instance variables for this.
+        if engine not in NEODatabase.Engines:
+            raise UnsupportedFeature(f'Unsupported engine: {engine}')
         self.filename = filename
+        self.engine = engine
         self.neo_dict = {}      #by id
         self.orbit_dict = {}        #by date
+        self.day_dict = defaultdict(list)       #by day
+        self.statistics = NEOStatistics()
+        self.strings = NearEarthObject.strings
 
 
     def load_data(self, filename=None):
@@ -27,6 +139,7 @@ class NEODatabase(object):
         Loads data from a .csv file, instantiating Near Earth Objects and their OrbitPaths by:
            - Storing a dict of orbit date to list of NearEarthObject instances
            - Storing a dict of the Near Earth Object name to the single instance of NearEarthObject
+           - Storing a dict of close approach day to list of OrbitPath instances and gathering NEOStatistics
 
         :param filename:
         :return:
@@ -38,16 +151,71 @@ class NEODatabase(object):
         filename = filename or self.filename
 
         # Load data from csv file.
-        df = pd.read_csv(filename)
+        if self.engine == 'pandas':
+            dict_list = self.__read_records_pandas(filename)
+        else:
+            dict_list = self.__read_records_csv(filename)
         # Where will the data be stored?
-        dict_list = df.to_dict(orient="records")
-        for item in dict_list: 
+        for item in dict_list:
+            new_orbit = False
+            # The key is computed once, a NaN sum from an empty cell is only found again by identity
+            orbit_key = item['kilometers_per_second']+item['miss_distance_kilometers']
             if item['close_approach_date_full'] not in self.orbit_dict:
                 self.orbit_dict[item['close_approach_date_full']] = {}
-            if item['kilometers_per_second']+item['miss_distance_kilometers'] not in self.orbit_dict[item['close_approach_date_full']]:
-                self.orbit_dict[item['close_approach_date_full']][item['kilometers_per_second']+item['miss_distance_kilometers']] = OrbitPath(**item)
-            current_orbit = self.orbit_dict[item['close_approach_date_full']][item['kilometers_per_second']+item['miss_distance_kilometers']]
+            if orbit_key not in self.orbit_dict[item['close_approach_date_full']]:
+                self.orbit_dict[item['close_approach_date_full']][orbit_key] = OrbitPath(**item)
+                new_orbit = True
+            current_orbit = self.orbit_dict[item['close_approach_date_full']][orbit_key]
 
             if item['id'] not in self.neo_dict:
                 self.neo_dict[item['id']] = NearEarthObject(**item)
-            self.neo_dict[item['id']].update_orbits(current_orbit)
\ No newline at end of file
+            self.neo_dict[item['id']].update_orbits(current_orbit)
+
+            # Orbits without a close approach day (a missing cell) cannot match a date search
+            if new_orbit and isinstance(current_orbit.close_approach_date, str):
+                self.day_dict[current_orbit.close_approach_date].append(current_orbit)
+        self.statistics.build(len(self.neo_dict), self.day_dict)
+
+    def __read_records_pandas(self, filename: str):
+        """
+        Reads the csv rows with pandas, which is only imported when this engine is selected.
+        """
+        import pandas as pd
+
+        df = pd.read_csv(filename)
+        return df.to_dict(orient="records")
+
+    def __read_records_csv(self, filename: str):
+        """
+        Reads the csv rows with the standard library csv module. As pandas.read_csv does, one type is inferred
+        per column (bool, int, float or str), int columns with missing cells become float and missing cells, empty,
+        one of NaValues or absent from a short row, are NaN.
+        """
+        with open(filename, newline='') as csv_file:
+            rows = list(csv.DictReader(csv_file))
+        columns = rows[0].keys() if rows else []
+        converters = {column: self.__column_converter([row[column] for row in rows]) for column in columns}
+        return [{key: converters[key](value) for key, value in row.items()} for row in rows]
+
+    @staticmethod
+    def __column_converter(values: list):
+        """
+        :param values: list of str values of a csv column
+        :return: function converting a str value of the column, NaValues are converted to NaN
+        """
+        missing = float('nan')
+        na_values = NEODatabase.NaValues
+        present = [value for value in values if value not in na_values]
+        if present and all(value in NEODatabase.BoolValues for value in present):
+            return lambda value: missing if value in na_values else NEODatabase.BoolValues[value]
+
+        for value_type in (int, float):
+            try:
+                for value in present:
+                    value_type(value)
+            except ValueError:
+                continue
+            if value_type is int and len(present) < len(values):
+                value_type = float
+            return lambda value: missing if value in na_values else value_type(value)
+        return lambda value: missing if value in na_values else value
@@ -15,6 +15,7 @@ Search options:
 Output options: Required.
 - display: prints to stdout
 - csv_file: exports data to a csv
+- explain: prints the query plan with estimated and actual rows per stage e.g. main.py explain -n 10 -d 2020-01-10
 
 Filters options: Optional. Input as: option:operation:value e.g. diameter:>=:0.042
 - is_hazardous:[=]:bool
@@ -25,7 +26,20 @@ Return objects options: Optional, defaults to NEO if not specified.
 - NEO
 - Path
 
+Order by options: Optional, returns the top -n results ranked by closest approach, fastest approach or largest NEO.
+e.g. main.py display -n 10 --start_date 2020-01-01 --end_date 2020-01-10 --order-by distance
+- distance
+- velocity
+- diameter
+
 Filename: Optional, used for specifying a filename for a csv to load data from. By default project looks for a csv in: data/neo_data.csv.
+
+Engine: Optional, csv reader used to load data, defaults to the standard library csv module.
+- csv
+- pandas
+
+pandas is only imported when the pandas engine loads the data, so --help, argument errors and csv engine queries
+start without it.
 """
 
 import argparse
@@ -35,10 +49,11 @@ from datetime import datetime
 
 from exceptions import UnsupportedFeature
 from database import NEODatabase
-from search import Query, NEOSearcher
+from search import Query, NEOSearcher, QueryPlanner, OrderBy
 from writer import OutputFormat, NEOWriter
 
 PROJECT_ROOT = pathlib.Path(__file__).parent.absolute()
+EXPLAIN = 'explain'
 
 
 def verify_date(datetime_str):
@@ -58,12 +73,12 @@ def verify_date(datetime_str):
 
 def verify_output_choice(choice):
     """
-    Function that verifies output choice is a supported OutputFormat.
+    Function that verifies output choice is a supported OutputFormat or explain.
 
-    :param choice:    String representing an OutputFormat
-    :return: str:     String representing an OutputFormat
+    :param choice:    String representing an OutputFormat or explain
+    :return: str:     String representing an OutputFormat or explain
     """
-    options = OutputFormat.list()
+    options = OutputFormat.list() + [EXPLAIN]
 
     if choice not in options:
         error_message = f'Not a valid output option: "{choice}"'
@@ -74,8 +89,8 @@ def verify_output_choice(choice):
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='Near Earth Objects (NEOs) Database')
-    parser.add_argument('output', choices=OutputFormat.list(), type=verify_output_choice,
-                        help='Select option for how to output the search results.')
+    parser.add_argument('output', choices=OutputFormat.list() + [EXPLAIN], type=verify_output_choice,
+                        help='Select option for how to output the search results, or explain to print the query plan.')
     parser.add_argument('-r', '--return_object', choices=['NEO', 'Path'],
                         default='NEO', type=str,
                         help='Select entity data to return.')
@@ -92,6 +107,11 @@ if __name__ == '__main__':
                                                     'distance:[>=|=|<=]:float.'
                                                     'Input as: [option:operation:value] '
                                                     'e.g. diameter:>=:0.042')
+    parser.add_argument('--order-by', choices=OrderBy.list(), type=str,
+                        help='Rank results and return the top -n by closest approach distance, '
+                             'fastest approach velocity or largest diameter.')
+    parser.add_argument('--engine', choices=NEODatabase.Engines, default='csv', type=str,
+                        help='Select csv reader used to load the data file.')
 
     args = parser.parse_args()
     var_args = vars(args)
@@ -102,7 +122,7 @@ if __name__ == '__main__':
     else:
         filename = f'{PROJECT_ROOT}/data/neo_data.csv'
 
-    db = NEODatabase(filename=filename)
+    db = NEODatabase(filename=filename, engine=args.engine)
 
     try:
         db.load_data()
@@ -116,6 +136,11 @@ if __name__ == '__main__':
     # Build Query
     query_selectors = Query(**var_args).build_query()
 
+    # Explain Query Plan
+    if args.output == EXPLAIN:
+        print(QueryPlanner.format(NEOSearcher(db).explain(query_selectors)))
+        sys.exit()
+
     # Get Results
     try:
         results = NEOSearcher(db).get_objects(query_selectors)
@@ -1,3 +1,69 @@
+class Categories(object):
+    """
+    Object holding one copy of each distinct value of a categorical attribute, each value is encoded as the
+    int index of its first occurrence.
+    """
+
+    def __init__(self):
+        self.values = []
+        self.codes = {}
+
+    def encode(self, value):
+        """
+        :param value: value to encode
+        :return: int code of the value, new values are appended to the table
+        """
+        if value not in self.codes:
+            self.codes[value] = len(self.values)
+            self.values.append(value)
+        return self.codes[value]
+
+    def decode(self, code: int):
+        """
+        :param code: int code returned by encode
+        :return: the shared instance of the encoded value
+        """
+        return self.values[code]
+
+
+class StringDictionary(object):
+    """
+    Object holding the string tables shared by all NearEarthObjects and OrbitPaths, so repeated strings are
+    stored once:
+       - url_templates stores the nasa_jpl_url with its id suffix replaced by URL_ID, so a URL is derived from the id
+       - orbiting_bodies and dates are categorical encodings of the OrbitPath orbiting body and close approach day,
+         the close approach timestamps are nearly unique so they are stored as is
+    """
+
+    URL_ID = '{id}'
+
+    def __init__(self):
+        self.url_templates = Categories()
+        self.orbiting_bodies = Categories()
+        self.dates = Categories()
+
+    def encode_url(self, url, neo_id):
+        """
+        :param url: str nasa_jpl_url of a NEO, or None
+        :param neo_id: id of the NEO
+        :return: int code of the url template
+        """
+        if isinstance(url, str) and url.endswith(str(neo_id)):
+            url = url[:-len(str(neo_id))] + StringDictionary.URL_ID
+        return self.url_templates.encode(url)
+
+    def decode_url(self, code: int, neo_id):
+        """
+        :param code: int code returned by encode_url
+        :param neo_id: id of the NEO
+        :return: str nasa_jpl_url of the NEO, or None
+        """
+        url = self.url_templates.decode(code)
+        if isinstance(url, str) and url.endswith(StringDictionary.URL_ID):
+            url = url[:-len(StringDictionary.URL_ID)] + str(neo_id)
+        return url
+
+
 class NearEarthObject(object):
     """
     Object containing data describing a Near Earth Object and it's orbits.
@@ -5,6 +71,9 @@ class NearEarthObject(object):
     # TODO: You may be adding instance methods to NearEarthObject to help you implement search and output data.
     """
 
+    # String tables shared by all NearEarthObjects and OrbitPaths
+    strings = StringDictionary()
+
     def __init__(self, **kwargs):
         """
         :param kwargs:    dict of attributes about a given Near Earth Object, only a subset of attributes used
@@ -14,12 +83,15 @@ class NearEarthObject(object):
         self.id = kwargs.get('id', None)
         if not self.id:
             raise Exception('No id for NEO!')
+        self._url_code = NearEarthObject.strings.encode_url(kwargs.get('nasa_jpl_url', None), self.id)
         self.name = kwargs.get('name', None)
-        self.nasa_jpl_url = kwargs.get('nasa_jpl_url', None)
         self.is_potentially_hazardous_asteroid = kwargs.get('is_potentially_hazardous_asteroid', None)
         self.diameter_min_km = kwargs.get('estimated_diameter_min_kilometers', None)
         self.diameter_max_km = kwargs.get('estimated_diameter_max_kilometers', None)
 
+    @property
+    def nasa_jpl_url(self):
+        return NearEarthObject.strings.decode_url(self._url_code, self.id)
 
     def update_orbits(self, orbit):
         """
@@ -47,21 +119,31 @@ class OrbitPath(object):
     # TODO: You may be adding instance methods to OrbitPath to help you implement search and output data.
     """
 
+    # String tables shared by all NearEarthObjects and OrbitPaths
+    strings = NearEarthObject.strings
+
     def __init__(self, **kwargs):
         """
         :param kwargs:    dict of attributes about a given orbit, only a subset of attributes used
         """
         # TODO: What instance variables will be useful for storing on the Near Earth Object?
         self.neo_set = set()
-        self.close_approach_date = kwargs.get('close_approach_date')
+        self._date_code = OrbitPath.strings.dates.encode(kwargs.get('close_approach_date'))
         self.close_approach_date_full = kwargs.get('close_approach_date_full')
+        self._body_code = OrbitPath.strings.orbiting_bodies.encode(kwargs.get('orbiting_body'))
         self.miss_distance_kilometers = kwargs.get('miss_distance_kilometers')
-        self.orbiting_body = kwargs.get('orbiting_body')
         self.kilometers_per_second = kwargs.get('kilometers_per_second')
 
+    @property
+    def close_approach_date(self):
+        return OrbitPath.strings.dates.decode(self._date_code)
+
+    @property
+    def orbiting_body(self):
+        return OrbitPath.strings.orbiting_bodies.decode(self._body_code)
+
     def update_neos(self, neo_obj: NearEarthObject):
         """
         Adds the id to the set of NEO Ids
         """
         self.neo_set.add(neo_obj)
-
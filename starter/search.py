@@ -1,9 +1,9 @@
 from collections import namedtuple, defaultdict
 from enum import Enum
-from datetime import datetime
+from datetime import datetime, timedelta
 from exceptions import UnsupportedFeature
 from models import NearEarthObject, OrbitPath
-from functools import reduce
+import heapq
 
 
 class DateSearch(Enum):
@@ -21,13 +21,30 @@ class DateSearch(Enum):
         return list(map(lambda output: output.value, DateSearch))
 
 
+class OrderBy(Enum):
+    """
+    Enum representing supported orderings of search results, closest approaches first for distance and
+    fastest approaches or largest NEOs first for velocity and diameter.
+    """
+    distance = 'distance'
+    velocity = 'velocity'
+    diameter = 'diameter'
+
+    @staticmethod
+    def list():
+        """
+        :return: list of string representations of OrderBy enums
+        """
+        return list(map(lambda output: output.value, OrderBy))
+
+
 class Query(object):
     """
     Object representing the desired search query operation to build. The Query uses the Selectors
     to structure the query information into a format the NEOSearcher can use for date search.
     """
 
-    Selectors = namedtuple('Selectors', ['date_search', 'number', 'filters', 'return_object'])
+    Selectors = namedtuple('Selectors', ['date_search', 'number', 'filters', 'return_object', 'order_by'])
     DateSearch = namedtuple('DateSearch', ['type', 'values'])
     ReturnObjects = {'NEO': NearEarthObject, 'Path': OrbitPath}
 
@@ -42,6 +59,7 @@ class Query(object):
         self.number = kwargs.get('number',None)
         self.return_object = kwargs.get('return_object',None)
         self.filter = kwargs.get('filter',None)
+        self.order_by = kwargs.get('order_by',None)
 
     def build_query(self):
         """
@@ -59,6 +77,7 @@ class Query(object):
         result = Query.Selectors(number=self.number, \
                 return_object=self.return_object, \
                 date_search=this_date_search, \
+                order_by=OrderBy(self.order_by) if self.order_by else None, \
                 filters=Filter.create_filter_options(self.filter, self.return_object))
         return result
 
@@ -160,6 +179,155 @@ class Filter(object):
 
 
 
+def missing_last(value):
+    """
+    Function that builds a sort key ordering missing (NaN) values, as loaded from empty csv cells, after
+    every other value.
+
+    :param value: float value to rank
+    :return: tuple sort key
+    """
+    return value != value, value
+
+
+class QueryPlanner(object):
+    """
+    Cost-based planner that, from the NEOStatistics gathered when the NEODatabase was loaded, chooses for a
+    Query.Selectors the access path to the OrbitPaths of its date search and the order its filters are applied in.
+
+    A plan is a list of Stages, each with the number of rows it is estimated to output.
+    """
+
+    Stage = namedtuple('Stage', ['operation', 'detail', 'estimated_rows', 'actual_rows'])
+
+    # Relative cost per OrbitPath of each filter, NearEarthObject filters go through the orbit neo_set
+    FilterCosts = {
+        "diameter": 2.0,
+        "is_hazardous": 2.0,
+        "distance": 1.0
+    }
+
+    def __init__(self, statistics):
+        """
+        :param statistics: NEOStatistics of the NEODatabase to search
+        """
+        self.statistics = statistics
+
+    def plan(self, query):
+        """
+        Builds the plan for a query: the date access path, the filters ordered by increasing cost / (1 - selectivity)
+        so cheap selective filters shrink the candidates first, then the ranking or NEO conversion and limit.
+
+        :param query: Query.Selectors object with query information
+        :return: list of QueryPlanner.Stage
+        """
+        stages = [self.__access_path(query.date_search)]
+        rows = stages[0].estimated_rows
+
+        filters = [filter_item for filter_list in (query.filters or {}).values() for filter_item in filter_list]
+        filters = [(filter_item, self.selectivity(filter_item)) for filter_item in filters]
+        for filter_item, selectivity in sorted(filters, key=lambda item: self.__filter_rank(*item)):
+            rows *= selectivity
+            stages.append(QueryPlanner.Stage('filter', filter_item, rows, None))
+
+        if query.return_object == 'NEO':
+            rows = min(rows * self.__neos_per_orbit(query.date_search), self.statistics.neo_count)
+        if query.order_by:
+            rows = rows if query.number is None else min(rows, query.number)
+            stages.append(QueryPlanner.Stage('top_ranked', query.order_by.value, rows, None))
+            return stages
+        if query.return_object == 'NEO':
+            stages.append(QueryPlanner.Stage('to_neo', None, rows, None))
+        if query.number is not None:
+            stages.append(QueryPlanner.Stage('limit', query.number, min(rows, query.number), None))
+        return stages
+
+    def selectivity(self, filter_item):
+        """
+        :param filter_item: Filter
+        :return: float estimated fraction of OrbitPaths passing the filter
+        """
+        statistics = self.statistics
+        if filter_item.field == "is_hazardous" and filter_item.operation == '=':
+            ratio = statistics.hazardous_ratio
+            return ratio if filter_item.value == 'True' else 1.0 - ratio
+        if filter_item.field == "diameter":
+            value = float(filter_item.value)
+            if filter_item.operation == '>':
+                return 1.0 - statistics.diameter_min_km.fraction_below(value)
+            if filter_item.operation == '<':
+                return statistics.diameter_max_km.fraction_below(value)
+            if filter_item.operation == '=':
+                return max(statistics.diameter_min_km.fraction_below(value)
+                           - statistics.diameter_max_km.fraction_below(value), 0.0)
+        if filter_item.field == "distance":
+            value = float(filter_item.value)
+            if filter_item.operation == '>':
+                return 1.0 - statistics.miss_distance_kilometers.fraction_below(value)
+            if filter_item.operation == '<':
+                return statistics.miss_distance_kilometers.fraction_below(value)
+            if filter_item.operation == '=':
+                return statistics.miss_distance_kilometers.fraction_equal(value)
+        return 1.0
+
+    @staticmethod
+    def format(stages: list):
+        """
+        :param stages: list of QueryPlanner.Stage, as returned by plan or NEOSearcher.explain
+        :return: str table of the stages with their estimated and actual rows
+        """
+        lines = [f"{'#':>2}  {'operation':<13}{'detail':<28}{'estimated':>10}{'actual':>10}"]
+        for number, stage in enumerate(stages, start=1):
+            detail = stage.detail
+            if isinstance(detail, Filter):
+                detail = f'{detail.field}:{detail.operation}:{detail.value}'
+            elif isinstance(detail, list):
+                detail = ' to '.join(detail)
+            actual = '' if stage.actual_rows is None else stage.actual_rows
+            lines.append(f"{number:>2}  {stage.operation:<13}{str(detail or ''):<28}"
+                         f"{round(stage.estimated_rows):>10}{actual:>10}")
+        return '\n'.join(lines)
+
+    def __access_path(self, date_search):
+        """
+        Chooses how to collect the OrbitPaths of the date search: a single day lookup, a lookup of each calendar day
+        in the range, or a scan of every day in the database when that is fewer days than the range.
+        """
+        day_counts = self.statistics.day_counts
+        rows = sum(day_counts.get(day, 0) for day in self.__days(date_search))
+        if date_search.type == DateSearch.equals:
+            return QueryPlanner.Stage('date_lookup', date_search.values, rows, None)
+
+        start_date, end_date = date_search.values
+        days = (datetime.strptime(end_date, "%Y-%m-%d") - datetime.strptime(start_date, "%Y-%m-%d")).days + 1
+        operation = 'date_range' if days <= len(day_counts) else 'date_scan'
+        return QueryPlanner.Stage(operation, [start_date, end_date], rows, None)
+
+    def __days(self, date_search):
+        """
+        :return: list of the days with close approaches matching the date search
+        """
+        if date_search.type == DateSearch.equals:
+            return [date_search.values] if date_search.values in self.statistics.day_counts else []
+        start_date, end_date = date_search.values
+        return [day for day in self.statistics.day_counts if start_date <= day <= end_date]
+
+    def __neos_per_orbit(self, date_search):
+        """
+        Estimates the distinct NEOs per OrbitPath of the date search from the per-day distinct NEO counts,
+        exact for a single day and an upper bound across days as NEOs seen on several days are counted once per day.
+        """
+        days = self.__days(date_search)
+        orbits = sum(self.statistics.day_counts[day] for day in days)
+        neos = sum(self.statistics.day_neo_counts.get(day, 0) for day in days)
+        return neos / orbits if orbits else 1.0
+
+    def __filter_rank(self, filter_item, selectivity):
+        if selectivity >= 1.0:
+            return float('inf')
+        return QueryPlanner.FilterCosts.get(filter_item.field, 1.0) / (1.0 - selectivity)
+
+
 class NEOSearcher(object):
     """
     Object with date search functionality on Near Earth Objects exposed by a generic
@@ -167,81 +335,115 @@ class NEOSearcher(object):
     how to perform the search.
     """
 
+    # Rank of an OrbitPath for each OrderBy, lower ranks are returned first and missing values last
+    Ranks = {
+        OrderBy.distance: lambda orbit: missing_last(orbit.miss_distance_kilometers),
+        OrderBy.velocity: lambda orbit: missing_last(-orbit.kilometers_per_second),
+        OrderBy.diameter: lambda orbit: missing_last(-max(
+            (neo.diameter_max_km for neo in orbit.neo_set if neo.diameter_max_km == neo.diameter_max_km),
+            default=float('nan')
+        )),
+    }
+
+    # Rank of a NearEarthObject for each OrderBy on its own attributes rather than through its OrbitPaths
+    NeoRanks = {
+        OrderBy.diameter: lambda neo: missing_last(-neo.diameter_max_km),
+    }
+
     def __init__(self, db):
         """
         :param db: NEODatabase holding the NearEarthObject instances and their OrbitPath instances
         """
         self.db = db
         # TODO: What kind of an instance variable can we use to connect DateSearch to how we do search?
+        self.operations = {
+            'date_lookup': self.__date_lookup,
+            'date_range': self.__date_range,
+            'date_scan': self.__date_scan,
+            'filter': self.__filter,
+            'top_ranked': self.__top_ranked,
+            'to_neo': self.__convert_to_neo,
+            'limit': self.__limit,
+        }
 
     def get_objects(self, query):
         """
         Generic search interface that, depending on the details in the QueryBuilder (query) calls the
-        appropriate instance search function, then applys any filters, with distance as the last filter.
+        appropriate instance search function, then applys any filters, in the order chosen by the QueryPlanner.
 
         Once any filters provided are applied, return the number of requested objects in the query.return_object
-        specified.
+        specified. If query.order_by is set, the requested number of objects are the top ranked ones.
 
         :param query: Query.Selectors object with query information
         :return: Dataset of NearEarthObjects or OrbitalPaths
         """
-        # TODO: This is a generic method that will need to understand, using DateSearch, how to implement search
-        # TODO: Write instance methods that get_objects can use to implement the two types of DateSearch your project
-        # TODO: needs to support that then your filters can be applied to. Remember to return the number specified in
-        # TODO: the Query.Selectors as well as in the return_type from Query.Selectors
-        if query.date_search.type == DateSearch.between:
-            candidate_list = self.__date_between(query.date_search.values, self.db.orbit_dict)
-        elif query.date_search.type == DateSearch.equals:
-            candidate_list = self.__date_equals(query.date_search.values, self.db.orbit_dict)
-        if query.filters:
-            for neo_id, filter_list in query.filters.items():
-                for filter_item in filter_list:
-                    candidate_list = filter_item.apply(candidate_list)
-        if query.return_object == 'NEO':
-            candidate_list = self.__convert_to_neo(candidate_list)
-        return candidate_list[:query.number]
+        plan = QueryPlanner(self.db.statistics).plan(query)
+        results, _ = self.__execute(plan, query)
+        return results
 
+    def explain(self, query):
+        """
+        Plans and runs the query, returning the plan with the actual number of rows output by each stage
 
-    def __date_equals(self, date: str, orbit_dict: dict):
-        result = []
-        base_date = datetime.strptime(date, "%Y-%m-%d")
-        for key in orbit_dict.keys():
-            try:
-                this_date = datetime.strptime(key, "%Y-%b-%d %H:%M").replace(hour=0, minute=0)
-            except:
-                #print(f"Failed to load {key}")
-                continue
-            if base_date == this_date:
-                result.append(orbit_dict[key])
-        path_list =[{x} for path_list in result for x in path_list.values()]
-        result_set = set()
-        result_set = reduce(lambda x,y: x.union(y),
-            path_list)
-        return list(result_set)
-
-
-    def __date_between(self, date: list, orbit_dict: dict):
+        :param query: Query.Selectors object with query information
+        :return: list of QueryPlanner.Stage
+        """
+        plan = QueryPlanner(self.db.statistics).plan(query)
+        _, actual_rows = self.__execute(plan, query)
+        return [stage._replace(actual_rows=rows) for stage, rows in zip(plan, actual_rows)]
+
+    def __execute(self, plan: list, query):
+        candidate_list = []
+        actual_rows = []
+        for stage in plan:
+            candidate_list = self.operations[stage.operation](stage, candidate_list, query)
+            actual_rows.append(len(candidate_list))
+        return candidate_list, actual_rows
+
+    def __date_lookup(self, stage, orb_list: list, query):
+        return list(self.db.day_dict.get(stage.detail, []))
+
+    def __date_range(self, stage, orb_list: list, query):
+        day = datetime.strptime(stage.detail[0], "%Y-%m-%d")
+        end_date = datetime.strptime(stage.detail[1], "%Y-%m-%d")
         result = []
-        start_date = datetime.strptime(date[0], "%Y-%m-%d")
-        end_date = datetime.strptime(date[1], "%Y-%m-%d")
-        for key in orbit_dict.keys():
-            try:
-                this_date = datetime.strptime(key, "%Y-%b-%d %H:%M").replace(hour=0, minute=0)
-            except:
-                #print(f"Failed to load {key}")
-                continue
-            if this_date >= start_date and this_date <= end_date:
-                result.append(orbit_dict[key])
-        path_list =[{x} for path_list in result for x in path_list.values()]
-        result_set = set()
-        result_set = reduce(lambda x,y: x.union(y),
-            path_list)
-        return list(result_set)
-        
-
-    def __convert_to_neo(self, orb_list: list):
-        neo_set = [x.neo_set for x in orb_list]
-        if len(neo_set) > 1:
-            neo_set = reduce(lambda x,y: x.union(y), neo_set)
-        return list(neo_set)
+        while day <= end_date:
+            result.extend(self.db.day_dict.get(day.strftime("%Y-%m-%d"), []))
+            day += timedelta(days=1)
+        return result
+
+    def __date_scan(self, stage, orb_list: list, query):
+        start_date, end_date = stage.detail
+        return [orbit for day, orbits in self.db.day_dict.items() if start_date <= day <= end_date
+                for orbit in orbits]
+
+    def __filter(self, stage, orb_list: list, query):
+        return stage.detail.apply(orb_list)
+
+    def __limit(self, stage, orb_list: list, query):
+        return orb_list[:stage.detail]
+
+    def __top_ranked(self, stage, orb_list: list, query):
+        """
+        Selects the query.number best ranked objects with a bounded heap, in O(n log K) instead of a full sort.
+        A NEO is ranked by its own attribute when it has one in NeoRanks, otherwise by its best ranked OrbitPath
+        among the candidates.
+        """
+        rank = NEOSearcher.Ranks[query.order_by]
+        if query.return_object == 'NEO' and query.order_by in NEOSearcher.NeoRanks:
+            orb_list, rank = self.__convert_to_neo(stage, orb_list, query), NEOSearcher.NeoRanks[query.order_by]
+        elif query.return_object == 'NEO':
+            neo_ranks = {}
+            for orbit in orb_list:
+                orbit_rank = rank(orbit)
+                for neo in orbit.neo_set:
+                    if neo not in neo_ranks or orbit_rank < neo_ranks[neo]:
+                        neo_ranks[neo] = orbit_rank
+            orb_list, rank = list(neo_ranks), neo_ranks.get
+        if query.number is None:
+            return sorted(orb_list, key=rank)
+        return heapq.nsmallest(query.number, orb_list, key=rank)
+
+    def __convert_to_neo(self, stage, orb_list: list, query):
+        return list(dict.fromkeys(neo for orbit in orb_list for neo in orbit.neo_set))
              
\ No newline at end of file
@@ -0,0 +1,62 @@
+import csv
+import random
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from database import NEODatabase
+
+
+FIELDS = [
+    'id', 'name', 'nasa_jpl_url', 'estimated_diameter_min_kilometers', 'estimated_diameter_max_kilometers',
+    'is_potentially_hazardous_asteroid', 'kilometers_per_second', 'close_approach_date',
+    'close_approach_date_full', 'miss_distance_kilometers', 'orbiting_body'
+]
+
+
+def write_neo_csv(filename, rows=500, neos=60, days=10, seed=303, blank_fields=()):
+    """
+    Writes a synthetic csv of NEO orbit paths in the neo_data.csv layout, spread over the days from 2020-01-01
+    at a random minute of the day, so close approach timestamps are mostly unique as in the NASA data.
+    The blank_fields are left empty on every tenth row.
+    """
+    rng = random.Random(seed)
+    with open(filename, 'w', newline='') as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(FIELDS)
+        for row in range(rows):
+            neo_id = 2000000 + row % neos
+            approach = datetime(2020, 1, 1) + timedelta(days=row % days, minutes=rng.randrange(24 * 60))
+            diameter = round(0.01 + (neo_id % neos) / 100, 4)
+            values = [
+                neo_id, f'({neo_id})', f'http://ssd.jpl.nasa.gov/sbdb.cgi?sstr={neo_id}',
+                diameter, round(diameter * 2.2, 5), neo_id % 3 == 0, round(rng.uniform(1, 30), 6),
+                approach.strftime('%Y-%m-%d'), approach.strftime('%Y-%b-%d %H:%M'),
+                round(rng.uniform(1e5, 7e7), 3), 'Earth'
+            ]
+            if row % 10 == 0:
+                values = ['' if field in blank_fields else value for field, value in zip(FIELDS, values)]
+            writer.writerow(values)
+
+
+class SyntheticNEODatabaseTestCase(unittest.TestCase):
+    """
+    Base Test Class loading a NEODatabase from a synthetic csv written by write_neo_csv, shared by the tests
+    of a class.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        cls.neo_data_file = f'{cls.tmp_dir.name}/neo_data.csv'
+        write_neo_csv(cls.neo_data_file)
+
+        cls.db = NEODatabase(filename=cls.neo_data_file)
+        cls.db.load_data()
+
+        cls.start_date = '2020-01-01'
+        cls.end_date = '2020-01-10'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
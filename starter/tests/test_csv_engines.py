@@ -0,0 +1,110 @@
+import math
+import tempfile
+import unittest
+
+from database import NEODatabase
+from exceptions import UnsupportedFeature
+from tests.neo_data import FIELDS, write_neo_csv
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+
+BLANK_FIELDS = (
+    'name', 'estimated_diameter_min_kilometers', 'estimated_diameter_max_kilometers',
+    'is_potentially_hazardous_asteroid', 'miss_distance_kilometers'
+)
+
+
+def loaded_values(db):
+    """
+    :param db: loaded NEODatabase
+    :return: sorted list of the repr of the model attributes, so NaN values and value types compare equal
+    """
+    values = []
+    for neo in db.neo_dict.values():
+        for orbit in neo.orbit_set:
+            values.append(repr((
+                neo.id, neo.name, neo.nasa_jpl_url, neo.is_potentially_hazardous_asteroid, neo.diameter_min_km,
+                neo.diameter_max_km, orbit.close_approach_date, orbit.close_approach_date_full,
+                orbit.miss_distance_kilometers, orbit.kilometers_per_second, orbit.orbiting_body
+            )))
+    return sorted(values)
+
+
+class TestCsvEngines(unittest.TestCase):
+    """
+    Test Class with test cases for the csv and pandas engines loading a csv with empty cells, and one with
+    pandas NA tokens and a short row.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        cls.neo_data_file = f'{cls.tmp_dir.name}/neo_data.csv'
+        write_neo_csv(cls.neo_data_file, blank_fields=BLANK_FIELDS)
+
+        cls.na_data_file = f'{cls.tmp_dir.name}/na_neo_data.csv'
+        write_neo_csv(cls.na_data_file)
+        with open(cls.na_data_file) as csv_file:
+            lines = csv_file.read().splitlines()
+        for line, token in zip((1, 2, 3), ('NA', 'N/A', 'null')):
+            fields = lines[line].split(',')
+            fields[FIELDS.index('estimated_diameter_max_kilometers')] = token
+            lines[line] = ','.join(fields)
+        lines[4] = ','.join(lines[4].split(',')[:FIELDS.index('miss_distance_kilometers')])
+        with open(cls.na_data_file, 'w') as csv_file:
+            csv_file.write('\n'.join(lines) + '\n')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
+
+    def test_csv_engine_empty_cells(self):
+        db = NEODatabase(filename=self.neo_data_file, engine='csv')
+        db.load_data()
+
+        self.assertEqual(db.statistics.orbit_count, 500)
+        neo = db.neo_dict[2000000]
+        self.assertTrue(math.isnan(neo.diameter_min_km) and math.isnan(neo.name))
+        self.assertIsInstance(db.neo_dict[2000001].diameter_min_km, float)
+        self.assertIsInstance(db.neo_dict[2000001].is_potentially_hazardous_asteroid, bool)
+
+    def test_csv_engine_na_values_and_short_row(self):
+        db = NEODatabase(filename=self.na_data_file, engine='csv')
+        db.load_data()
+
+        self.assertEqual(db.statistics.orbit_count, 500)
+        diameters = [neo.diameter_max_km for neo in db.neo_dict.values()]
+        self.assertTrue(all(isinstance(diameter, float) for diameter in diameters))
+        self.assertEqual(sum(math.isnan(diameter) for diameter in diameters), 3)
+        distances = [orbit.miss_distance_kilometers for orbits in db.day_dict.values() for orbit in orbits]
+        self.assertEqual(sum(math.isnan(distance) for distance in distances), 1)
+
+    def test_unsupported_engine(self):
+        with self.assertRaises(UnsupportedFeature):
+            NEODatabase(filename=self.neo_data_file, engine='excel')
+
+    @unittest.skipIf(pandas is None, 'pandas is not installed')
+    def test_csv_engine_matches_pandas_engine(self):
+        csv_db = NEODatabase(filename=self.neo_data_file, engine='csv')
+        csv_db.load_data()
+        pandas_db = NEODatabase(filename=self.neo_data_file, engine='pandas')
+        pandas_db.load_data()
+
+        self.assertEqual(loaded_values(csv_db), loaded_values(pandas_db))
+
+    @unittest.skipIf(pandas is None, 'pandas is not installed')
+    def test_csv_engine_matches_pandas_engine_na_values(self):
+        csv_db = NEODatabase(filename=self.na_data_file, engine='csv')
+        csv_db.load_data()
+        pandas_db = NEODatabase(filename=self.na_data_file, engine='pandas')
+        pandas_db.load_data()
+
+        self.assertEqual(loaded_values(csv_db), loaded_values(pandas_db))
+
+
+if __name__ == '__main__':
+    unittest.main()
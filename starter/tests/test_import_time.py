@@ -0,0 +1,68 @@
+import pathlib
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from tests.neo_data import write_neo_csv
+
+
+PROJECT_ROOT = pathlib.Path(__file__).parent.parent
+
+# Cumulative import budget, in microseconds, for everything loaded before main.py parses its arguments,
+# interpreter startup included. Importing pandas alone takes several times this on a typical machine.
+IMPORT_TIME_BUDGET_US = 150000
+
+
+def import_times(*args, top_level=True):
+    """
+    Runs main.py under `python -X importtime` and returns the cumulative import time of the imported modules.
+
+    :param args: command line arguments passed to main.py
+    :param top_level: bool, only return the top level imports when True
+    :return: dict of module name to cumulative import time in microseconds
+    """
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', 'main.py', *args],
+        cwd=PROJECT_ROOT, capture_output=True, text=True
+    )
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, module = line[len('import time:'):].split('|')
+        # Nested imports are indented by two spaces per level below the top level module
+        if not (top_level and module.startswith('   ')):
+            times[module.strip()] = int(cumulative_us)
+    return times
+
+
+class TestMainImportTime(unittest.TestCase):
+    """
+    Test Class checking which modules main.py imports. The import-time benchmark against IMPORT_TIME_BUDGET_US
+    is not part of the tests, run it with `python -m tests.test_import_time`.
+    """
+
+    def test_help_does_not_import_heavy_modules(self):
+        times = import_times('--help', top_level=False)
+
+        self.assertIn('writer', times)
+        self.assertNotIn('pandas', times)
+
+    def test_csv_query_does_not_import_pandas(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            write_neo_csv(f'{tmp_dir}/neo_data.csv')
+            times = import_times('display', '-n', '3', '-d', '2020-01-01', '-f', f'{tmp_dir}/neo_data.csv',
+                                 top_level=False)
+
+        self.assertIn('database', times)
+        self.assertNotIn('pandas', times)
+
+
+if __name__ == '__main__':
+    times = import_times('--help')
+    for module, time in sorted(times.items(), key=lambda item: -item[1])[:10]:
+        print(f'{time:>10} us  {module}')
+    total = sum(times.values())
+    print(f'{total:>10} us  total, budget {IMPORT_TIME_BUDGET_US} us')
+    sys.exit(total > IMPORT_TIME_BUDGET_US)
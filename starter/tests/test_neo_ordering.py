@@ -0,0 +1,98 @@
+import csv
+import tempfile
+import unittest
+
+from database import NEODatabase
+from search import Query, NEOSearcher
+from tests.neo_data import FIELDS, SyntheticNEODatabaseTestCase, write_neo_csv
+
+
+class TestNEOSearchOrderBy(SyntheticNEODatabaseTestCase):
+    """
+    Test Class with test cases for top-K ordered searches, comparing the bounded heap selection
+    against a full sort of the unordered search results.
+    """
+
+    def test_closest_paths_between_dates(self):
+        query_selectors = Query(
+            number=5, start_date=self.start_date, end_date=self.end_date, return_object='Path', order_by='distance'
+        ).build_query()
+        results = NEOSearcher(self.db).get_objects(query_selectors)
+
+        all_paths = NEOSearcher(self.db).get_objects(query_selectors._replace(number=None, order_by=None))
+        expected = sorted(path.miss_distance_kilometers for path in all_paths)[:5]
+        self.assertEqual([path.miss_distance_kilometers for path in results], expected)
+
+    def test_fastest_neos_between_dates_with_hazardous(self):
+        query_selectors = Query(
+            number=3, start_date=self.start_date, end_date=self.end_date,
+            return_object='NEO', order_by='velocity', filter=["is_hazardous:=:True"]
+        ).build_query()
+        results = NEOSearcher(self.db).get_objects(query_selectors)
+
+        self.assertEqual(len(results), 3)
+        self.assertTrue(all(neo.is_potentially_hazardous_asteroid for neo in results))
+        fastest = [max(orbit.kilometers_per_second for orbit in neo.orbit_set) for neo in results]
+        expected = sorted((max(orbit.kilometers_per_second for orbit in neo.orbit_set)
+                           for neo in self.db.neo_dict.values() if neo.is_potentially_hazardous_asteroid),
+                          reverse=True)[:3]
+        self.assertEqual(fastest, expected)
+
+    def test_largest_neos_between_dates(self):
+        query_selectors = Query(
+            number=10, start_date=self.start_date, end_date=self.end_date, return_object='NEO', order_by='diameter'
+        ).build_query()
+        results = NEOSearcher(self.db).get_objects(query_selectors)
+
+        diameters = [neo.diameter_max_km for neo in results]
+        expected = sorted((neo.diameter_max_km for neo in self.db.neo_dict.values()), reverse=True)[:10]
+        self.assertEqual(len(set(results)), 10)
+        self.assertEqual(diameters, expected)
+
+    def test_largest_neos_sharing_an_orbit(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with open(f'{tmp_dir}/neo_data.csv', 'w', newline='') as csv_file:
+                writer = csv.writer(csv_file)
+                writer.writerow(FIELDS)
+                for neo_id, diameter in ((1, 1.0), (2, 9.0), (3, 5.0)):
+                    writer.writerow([neo_id, f'({neo_id})', '', diameter / 2, diameter, False, 10.0,
+                                     '2020-01-01', '2020-Jan-01 00:00', 1000.0 * (neo_id != 2), 'Earth'])
+            db = NEODatabase(filename=f'{tmp_dir}/neo_data.csv')
+            db.load_data()
+
+        query_selectors = Query(number=3, date='2020-01-01', return_object='NEO', order_by='diameter').build_query()
+        results = NEOSearcher(db).get_objects(query_selectors)
+
+        self.assertEqual([neo.id for neo in results], [2, 3, 1])
+
+    def test_missing_values_ranked_last(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            write_neo_csv(f'{tmp_dir}/neo_data.csv', blank_fields=(
+                'miss_distance_kilometers', 'kilometers_per_second', 'estimated_diameter_max_kilometers'
+            ))
+            db = NEODatabase(filename=f'{tmp_dir}/neo_data.csv')
+            db.load_data()
+
+        def closest(neo):
+            return min((orbit.miss_distance_kilometers for orbit in neo.orbit_set
+                        if orbit.miss_distance_kilometers == orbit.miss_distance_kilometers), default=float('nan'))
+
+        for order_by, return_object, value in (
+            ('distance', 'Path', lambda path: path.miss_distance_kilometers),
+            ('velocity', 'Path', lambda path: -path.kilometers_per_second),
+            ('distance', 'NEO', closest),
+            ('diameter', 'NEO', lambda neo: -neo.diameter_max_km),
+        ):
+            query_selectors = Query(
+                start_date=self.start_date, end_date=self.end_date, return_object=return_object, order_by=order_by
+            ).build_query()
+            all_values = [value(item) for item in NEOSearcher(db).get_objects(query_selectors)]
+            results = NEOSearcher(db).get_objects(query_selectors._replace(number=5))
+
+            present = [item for item in all_values if item == item]
+            self.assertLess(len(present), len(all_values))
+            self.assertEqual(all_values[:len(present)], sorted(present))
+            self.assertEqual([value(item) for item in results], sorted(present)[:5])
+
+if __name__ == '__main__':
+    unittest.main()
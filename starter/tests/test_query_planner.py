@@ -0,0 +1,120 @@
+import tempfile
+import unittest
+
+from database import Histogram, NEODatabase
+from search import Query, NEOSearcher, QueryPlanner
+from tests.neo_data import SyntheticNEODatabaseTestCase, write_neo_csv
+
+
+class TestQueryPlanner(SyntheticNEODatabaseTestCase):
+    """
+    Test Class with test cases for the statistics gathered at load time and the plans the QueryPlanner
+    chooses from them.
+    """
+
+    def test_statistics(self):
+        statistics = self.db.statistics
+
+        self.assertEqual(statistics.orbit_count, 500)
+        self.assertEqual(statistics.neo_count, 60)
+        self.assertEqual(dict(statistics.day_counts), {f'2020-01-{day:02d}': 50 for day in range(1, 11)})
+        hazardous = [orbit for orbits in self.db.day_dict.values() for orbit in orbits
+                     if any(neo.is_potentially_hazardous_asteroid for neo in orbit.neo_set)]
+        self.assertAlmostEqual(statistics.hazardous_ratio, len(hazardous) / 500)
+        self.assertFalse([value for value in vars(statistics).values() if isinstance(value, list)])
+
+    def test_statistics_skip_missing_values(self):
+        histogram = Histogram([1.0, float('nan'), None, '', 2.0])
+        self.assertEqual((histogram.count, histogram.low, histogram.high), (2, 1.0, 2.0))
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            write_neo_csv(f'{tmp_dir}/neo_data.csv', blank_fields=(
+                'estimated_diameter_min_kilometers', 'estimated_diameter_max_kilometers',
+                'is_potentially_hazardous_asteroid'
+            ))
+            db = NEODatabase(filename=f'{tmp_dir}/neo_data.csv')
+            db.load_data()
+
+        self.assertEqual(db.statistics.orbit_count, 500)
+        self.assertEqual(db.statistics.diameter_min_km.count, 450)
+        self.assertEqual(db.statistics.miss_distance_kilometers.count, 500)
+
+    def test_missing_close_approach_day(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            write_neo_csv(f'{tmp_dir}/neo_data.csv', blank_fields=('close_approach_date',))
+            db = NEODatabase(filename=f'{tmp_dir}/neo_data.csv')
+            db.load_data()
+
+        self.assertEqual(sum(db.statistics.day_counts.values()), 450)
+        self.assertTrue(all(isinstance(day, str) for day in db.day_dict))
+        for start_date, end_date in ((self.start_date, self.end_date), ('2019-01-01', '2021-01-01')):
+            query_selectors = Query(start_date=start_date, end_date=end_date, return_object='Path').build_query()
+            plan = NEOSearcher(db).explain(query_selectors)
+            self.assertEqual((plan[0].estimated_rows, plan[0].actual_rows), (450, 450))
+
+    def test_access_paths(self):
+        plan = QueryPlanner(self.db.statistics).plan(Query(date=self.start_date, return_object='Path').build_query())
+        self.assertEqual([stage.operation for stage in plan], ['date_lookup'])
+        self.assertEqual(plan[0].estimated_rows, 50)
+
+        plan = QueryPlanner(self.db.statistics).plan(
+            Query(start_date=self.start_date, end_date='2020-01-03', return_object='Path').build_query()
+        )
+        self.assertEqual((plan[0].operation, plan[0].estimated_rows), ('date_range', 150))
+
+        plan = QueryPlanner(self.db.statistics).plan(
+            Query(start_date='2019-01-01', end_date='2021-01-01', return_object='Path').build_query()
+        )
+        self.assertEqual((plan[0].operation, plan[0].estimated_rows), ('date_scan', 500))
+
+    def test_neo_estimate(self):
+        plan = NEOSearcher(self.db).explain(Query(date=self.start_date, return_object='NEO').build_query())
+        self.assertEqual(plan[-1].operation, 'to_neo')
+        self.assertAlmostEqual(plan[-1].estimated_rows, plan[-1].actual_rows)
+
+        plan = NEOSearcher(self.db).explain(
+            Query(start_date=self.start_date, end_date=self.end_date, return_object='NEO').build_query()
+        )
+        self.assertGreaterEqual(plan[-1].estimated_rows, plan[-1].actual_rows)
+        self.assertLessEqual(plan[-1].estimated_rows, 2 * plan[-1].actual_rows)
+
+    def test_selective_filters_first(self):
+        query_selectors = Query(
+            number=10, start_date=self.start_date, end_date=self.end_date, return_object='NEO',
+            filter=["distance:>:0", "is_hazardous:=:True", "diameter:>:0.5"]
+        ).build_query()
+        plan = QueryPlanner(self.db.statistics).plan(query_selectors)
+
+        filters = [stage.detail.field for stage in plan if stage.operation == 'filter']
+        self.assertEqual(filters, ['diameter', 'is_hazardous', 'distance'])
+        self.assertEqual([stage.operation for stage in plan][-2:], ['to_neo', 'limit'])
+
+    def test_explain_matches_results(self):
+        query_selectors = Query(
+            start_date=self.start_date, end_date=self.end_date, return_object='NEO',
+            filter=["distance:>:234989", "is_hazardous:=:True", "diameter:>:0.042"]
+        ).build_query()
+        plan = NEOSearcher(self.db).explain(query_selectors)
+        results = NEOSearcher(self.db).get_objects(query_selectors)
+
+        # Apply the filters in their given order to every OrbitPath in the date range, without the planner
+        given_filters = query_selectors.filters['NEO']
+        candidates = [orbit for neo in self.db.neo_dict.values() for orbit in neo.orbit_set
+                      if self.start_date <= orbit.close_approach_date <= self.end_date]
+        candidates = list(set(candidates))
+        self.assertEqual(plan[0].actual_rows, len(candidates))
+        for filter_item in given_filters:
+            candidates = filter_item.apply(candidates)
+        expected = {neo for orbit in candidates for neo in orbit.neo_set}
+
+        planned_filters = [stage.detail for stage in plan if stage.operation == 'filter']
+        self.assertNotEqual(planned_filters, given_filters)
+        self.assertCountEqual(planned_filters, given_filters)
+        self.assertEqual(plan[len(planned_filters)].actual_rows, len(candidates))
+        self.assertEqual(set(results), expected)
+        self.assertEqual(len(results), len(expected))
+        self.assertEqual(plan[-1].actual_rows, len(results))
+        self.assertIn('estimated', QueryPlanner.format(plan))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import io
+import pathlib
+import subprocess
+import sys
+import tarfile
+import tempfile
+import unittest
+from datetime import datetime
+
+from models import NearEarthObject, OrbitPath
+from tests.neo_data import SyntheticNEODatabaseTestCase, write_neo_csv
+
+
+PROJECT_ROOT = pathlib.Path(__file__).parent.parent
+
+
+class TestStringDictionary(SyntheticNEODatabaseTestCase):
+    """
+    Test Class with test cases for the string tables shared by the models of a NEODatabase; run this module
+    with `python -m tests.test_string_dictionary [revision]` to print the memory retained by loading a large
+    data set with the working tree and, optionally, with a git revision.
+    """
+
+    def test_neo_strings_decoded(self):
+        for neo_id, neo in self.db.neo_dict.items():
+            self.assertEqual(neo.id, neo_id)
+            self.assertEqual(neo.nasa_jpl_url, f'http://ssd.jpl.nasa.gov/sbdb.cgi?sstr={neo_id}')
+        self.assertIn('http://ssd.jpl.nasa.gov/sbdb.cgi?sstr={id}', self.db.strings.url_templates.values)
+        for neo in self.db.neo_dict.values():
+            self.assertEqual(set(vars(neo)) & {'id', 'nasa_jpl_url', '_strings'}, {'id'})
+
+    def test_orbit_strings_shared(self):
+        orbits = [orbit for neo in self.db.neo_dict.values() for orbit in neo.orbit_set]
+
+        self.assertEqual({orbit.orbiting_body for orbit in orbits}, {'Earth'})
+        self.assertEqual(len({id(orbit.orbiting_body) for orbit in orbits}), 1)
+        for orbit in orbits:
+            approach = datetime.strptime(orbit.close_approach_date_full, '%Y-%b-%d %H:%M')
+            self.assertEqual(approach.strftime('%Y-%m-%d'), orbit.close_approach_date)
+        self.assertLessEqual({f'2020-01-{day:02d}' for day in range(1, 11)}, set(self.db.strings.dates.values))
+        self.assertNotIn('_strings', vars(orbits[0]))
+
+    def test_models_without_database(self):
+        neo = NearEarthObject(id=3542519, nasa_jpl_url='https://example.com/neo.html')
+        orbit = OrbitPath(close_approach_date='2020-01-01', orbiting_body='Mars')
+
+        self.assertEqual(neo.id, 3542519)
+        self.assertEqual(neo.nasa_jpl_url, 'https://example.com/neo.html')
+        self.assertEqual((orbit.close_approach_date, orbit.orbiting_body), ('2020-01-01', 'Mars'))
+
+
+def retained_memory(source_dir, filename):
+    """
+    Loads a csv with the NEODatabase of a source directory in a new interpreter, measured with tracemalloc.
+
+    :param source_dir: str path of the directory holding database.py and models.py
+    :param filename: str path of the csv to load
+    :return: int bytes retained by the loaded NEODatabase
+    """
+    code = ('import sys, tracemalloc; from database import NEODatabase; tracemalloc.start(); '
+            'db = NEODatabase(filename=sys.argv[1]); db.load_data(); print(tracemalloc.get_traced_memory()[0])')
+    process = subprocess.run([sys.executable, '-c', code, filename], cwd=source_dir,
+                             capture_output=True, text=True, check=True)
+    return int(process.stdout)
+
+
+if __name__ == '__main__':
+    # Usage: python -m tests.test_string_dictionary [git revision to compare the working tree against]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        write_neo_csv(f'{tmp_dir}/neo_data.csv', rows=200000, neos=20000, days=365)
+        sources = {'working tree': PROJECT_ROOT}
+        if len(sys.argv) > 1:
+            toplevel, prefix = subprocess.run(['git', 'rev-parse', '--show-toplevel', '--show-prefix'],
+                                              cwd=PROJECT_ROOT, capture_output=True, text=True,
+                                              check=True).stdout.splitlines()
+            archive = subprocess.run(['git', 'archive', '--format=tar', f'{sys.argv[1]}:{prefix}'], cwd=toplevel,
+                                     capture_output=True, check=True).stdout
+            tarfile.open(fileobj=io.BytesIO(archive)).extractall(f'{tmp_dir}/{sys.argv[1]}')
+            sources = {sys.argv[1]: f'{tmp_dir}/{sys.argv[1]}', **sources}
+        for name, source_dir in sources.items():
+            print(f'{name}: {retained_memory(source_dir, f"{tmp_dir}/neo_data.csv") / 2 ** 20:.1f} MiB retained')